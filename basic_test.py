@@ -1,68 +1,101 @@
 #!/usr/bin/env python3
 """
 Super Mario Bros - 基础测试版本
-纯Python实现，不依赖任何外部库
+纯Python实现，仅依赖NumPy
 """
 
+import sys
 import time
-import random
+import numpy as np
 
-def create_ascii_game_frame(step_count, mario_x=10):
-    """创建ASCII游戏画面"""
-    frame = []
-    height = 15
-    width = 40
-    
-    # 创建空画面
-    for y in range(height):
-        frame.append([' '] * width)
-    
-    # 添加地面
-    for x in range(width):
-        frame[height-1][x] = '='
-        frame[height-2][x] = '='
-    
+# 尝试导入Numba，如果失败则使用纯Python内核
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+    def njit(*args, **kwargs):
+        """Numba不可用时的空装饰器"""
+        return lambda func: func
+
+# 画面尺寸
+HEIGHT = 15
+WIDTH = 40
+
+# 画面字符（uint8编码）
+_MARIO = ord('M')
+_OBSTACLE = ord('X')
+_COIN = ord('$')
+_CLOUD = ord('.')
+
+# 空画面模板（空格填充 + 两行地面），每帧复制一次
+_TEMPLATE = np.full((HEIGHT, WIDTH), ord(' '), dtype=np.uint8)
+_TEMPLATE[-2:, :] = ord('=')
+
+@njit(cache=True, boundscheck=False)
+def _fill_frame(buf, step_count, mario_x):
+    """在空画面缓冲区上绘制精灵"""
     # 添加马里奥 (M)
-    mario_y = height - 3
-    if 0 <= mario_x < width:
-        frame[mario_y][mario_x] = 'M'
+    if 0 <= mario_x < WIDTH:
+        buf[HEIGHT - 3, mario_x] = _MARIO
     
     # 添加障碍物 (X)
     if step_count > 10:
-        obstacle_x = 25
-        obstacle_y = height - 3
-        if 0 <= obstacle_x < width:
-            frame[obstacle_y][obstacle_x] = 'X'
+        buf[HEIGHT - 3, 25] = _OBSTACLE
     
     # 添加金币 ($)
     if step_count % 20 < 10:
-        coin_x = 15
-        coin_y = height - 5
-        if 0 <= coin_x < width:
-            frame[coin_y][coin_x] = '$'
+        buf[HEIGHT - 5, 15] = _COIN
     
     # 添加云朵 (.)
-    cloud_x = 5
-    cloud_y = 3
-    if 0 <= cloud_x < width:
-        frame[cloud_y][cloud_x] = '.'
-        frame[cloud_y][cloud_x+1] = '.'
-        frame[cloud_y][cloud_x+2] = '.'
-    
+    for x in range(5, 8):
+        buf[3, x] = _CLOUD
+
+def warmup():
+    """预编译绘制内核，避免游戏循环中首次调用的JIT延迟"""
+    _fill_frame(_TEMPLATE.copy(), 0, 0)
+
+def create_ascii_game_frame(step_count, mario_x=10):
+    """创建ASCII游戏画面，返回 (HEIGHT, WIDTH) 的uint8字符数组"""
+    frame = _TEMPLATE.copy()
+    _fill_frame(frame, step_count, mario_x)
     return frame
 
-def display_frame(frame):
-    """显示游戏画面"""
-    print("\n" + "="*50)
-    for row in frame:
-        print("|" + "".join(row) + "|")
-    print("="*50)
+# 画面边框
+_BORDER = "=" * 50
+
+# 游戏信息模板，参数为 (步数, 分数, 生命, 马里奥位置)
+_STATUS = "步数: %4d | 分数: %4d | 生命: %d | 马里奥位置: %d\n".__mod__
+
+def format_frame(frame):
+    """将游戏画面格式化为带边框的字符串"""
+    rows = "\n".join("|" + row.tobytes().decode('ascii') + "|" for row in frame)
+    return "\n" + _BORDER + "\n" + rows + "\n" + _BORDER + "\n"
+
+# 自动模式的帧间隔（秒）
+FRAME_INTERVAL = 0.5
+
+# 每批预生成的随机步进数量
+BATCH = 4096
+
+def random_steps(rng, max_score, batch=BATCH):
+    """按批生成随机步进 (位移, 得分, 生命判定值)，用完后自动补充"""
+    while True:
+        dx = rng.integers(-1, 3, batch).tolist()
+        dscore = rng.integers(0, max_score + 1, batch).tolist()
+        rolls = rng.random(batch).tolist()
+        yield from zip(dx, dscore, rolls)
 
 def main():
     """主函数"""
     print("🍄 Super Mario Bros - 基础测试版本")
     print("=" * 50)
     
+    # 预编译画面内核（没有Numba时无需预热）
+    if HAS_NUMBA:
+        warmup()
+    
     # 游戏状态
     score = 0
     lives = 3
@@ -70,6 +103,11 @@ def main():
     mario_x = 10
     done = False
     
+    # 批量随机数（自动模式与手动步进的得分范围不同）
+    rng = np.random.default_rng()
+    auto_steps = random_steps(rng, 10)
+    manual_steps = random_steps(rng, 5)
+    
     print("游戏说明:")
     print("- 马里奥用 'M' 表示")
     print("- 障碍物用 'X' 表示") 
@@ -84,12 +122,11 @@ def main():
     print()
     
     while not done:
-        # 显示游戏信息
-        print(f"步数: {step_count:4d} | 分数: {score:4d} | 生命: {lives} | 马里奥位置: {mario_x}")
-        
-        # 创建并显示游戏画面
+        # 显示游戏信息和游戏画面（一次写入）
         frame = create_ascii_game_frame(step_count, mario_x)
-        display_frame(frame)
+        sys.stdout.write(
+            _STATUS((step_count, score, lives, mario_x)) + format_frame(frame)
+        )
         
         # 获取用户输入
         user_input = input("输入命令 (Enter=继续, q=退出, r=重置, a=自动): ").strip().lower()
@@ -108,13 +145,16 @@ def main():
             # 自动游戏模式
             print("自动游戏模式启动！按 Ctrl+C 停止")
             try:
+                # 按固定截止时间调度，帧间隔不随每帧的计算时间漂移
+                next_t = time.monotonic() + FRAME_INTERVAL
                 while True:
+                    dx, dscore, roll = next(auto_steps)
                     step_count += 1
-                    mario_x = (mario_x + random.randint(-1, 2)) % 40
-                    score += random.randint(0, 10)
+                    mario_x = (mario_x + dx) % 40
+                    score += dscore
                     
                     # 随机减少生命
-                    if random.random() < 0.1:
+                    if roll < 0.1:
                         lives -= 1
                         if lives <= 0:
                             print("游戏结束！生命耗尽！")
@@ -122,22 +162,29 @@ def main():
                             break
                     
                     frame = create_ascii_game_frame(step_count, mario_x)
-                    display_frame(frame)
-                    
-                    print(f"步数: {step_count:4d} | 分数: {score:4d} | 生命: {lives} | 马里奥位置: {mario_x}")
-                    time.sleep(0.5)
+                    sys.stdout.write(
+                        format_frame(frame) + _STATUS((step_count, score, lives, mario_x))
+                    )
+                    sleep_for = next_t - time.monotonic()
+                    if sleep_for > 0:
+                        time.sleep(sleep_for)
+                    else:
+                        # 本帧超时（如终端输出被阻塞），从当前时间重新计时，避免连续补帧
+                        next_t = time.monotonic()
+                    next_t += FRAME_INTERVAL
                     
             except KeyboardInterrupt:
                 print("\n自动游戏已停止")
                 continue
         else:
             # 正常游戏步进
+            dx, dscore, roll = next(manual_steps)
             step_count += 1
-            mario_x = (mario_x + random.randint(-1, 2)) % 40
-            score += random.randint(0, 5)
+            mario_x = (mario_x + dx) % 40
+            score += dscore
             
             # 随机减少生命
-            if random.random() < 0.05:
+            if roll < 0.05:
                 lives -= 1
                 if lives <= 0:
                     print("游戏结束！生命耗尽！")
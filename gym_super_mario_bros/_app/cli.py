@@ -5,7 +5,9 @@ import gym
 from nes_py.wrappers import JoypadSpace
 from nes_py.app.play_human import play_human
 from nes_py.app.play_random import play_random
+from .._registration import REGISTERED_ENV_IDS
 from ..actions import RIGHT_ONLY, SIMPLE_MOVEMENT, COMPLEX_MOVEMENT
+from ..smb_random_stages_env import _parse_stage
 
 
 # a key mapping of action spaces to wrap with
@@ -16,6 +18,26 @@ _ACTION_SPACES = {
 }
 
 
+def _stage(value):
+    """
+    Validate a stage argument of the form '<world>-<stage>'.
+
+    Args:
+        value (str): the command line value to validate, e.g., '4-2'
+
+    Returns (str):
+        the value unchanged if it names a stage in Super Mario Bros.
+
+    """
+    # validate with the same parser the random stages environment uses
+    try:
+        _parse_stage(value)
+    except (TypeError, ValueError) as error:
+        raise argparse.ArgumentTypeError(str(error))
+
+    return value
+
+
 def _get_args():
     """Parse command line arguments and return them."""
     parser = argparse.ArgumentParser(description=__doc__)
@@ -42,10 +64,14 @@ def _get_args():
         help='The number of random steps to take.',
     )
     parser.add_argument('--stages', '-S',
-        type=str,
+        type=_stage,
         nargs='+',
         help='The random stages to sample from for a random stage env'
     )
+    parser.add_argument('--list_envs', '-l',
+        action='store_true',
+        help='List the IDs of the registered environments and exit'
+    )
     # parse arguments and return them
     return parser.parse_args()
 
@@ -54,6 +80,10 @@ def main():
     """The main entry point for the command line interface."""
     # parse arguments from the command line (argparse validates arguments)
     args = _get_args()
+    # list the environment IDs in a single write and exit
+    if args.list_envs:
+        sys.stdout.write('\n'.join(REGISTERED_ENV_IDS) + '\n')
+        sys.exit(0)
     if args.stages is not None and 'RandomStages' not in args.env:
         print('--stages,-S should only be specified for RandomStages environments')
         sys.exit(1)
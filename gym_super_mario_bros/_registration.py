@@ -1,7 +1,12 @@
 """Registration code of Gym environments in this package."""
+from itertools import product
 import gym
 
 
+# the IDs of every environment registered by this module, in order
+REGISTERED_ENV_IDS = []
+
+
 def _register_mario_env(id, is_random=False, **kwargs):
     """
     Register a Super Mario Bros. (1/2) environment with OpenAI Gym.
@@ -31,6 +36,8 @@ def _register_mario_env(id, is_random=False, **kwargs):
         kwargs=kwargs,
         nondeterministic=True,
     )
+    # record the ID so it can be listed without scanning the gym registry
+    REGISTERED_ENV_IDS.append(id)
 
 
 # Super Mario Bros.
@@ -73,28 +80,29 @@ def _register_mario_stage_env(id, **kwargs):
         kwargs=kwargs,
         nondeterministic=True,
     )
+    # record the ID so it can be listed without scanning the gym registry
+    REGISTERED_ENV_IDS.append(id)
 
 
 # a template for making individual stage environments
 _ID_TEMPLATE = 'SuperMarioBros{}-{}-{}-v{}'
-# A list of ROM modes for each level environment
-_ROM_MODES = [
+# A tuple of ROM modes for each level environment
+_ROM_MODES = (
     'vanilla',
     'downsample',
     'pixel',
-    'rectangle'
-]
+    'rectangle',
+)
 
 
-# iterate over all the rom modes, worlds (1-8), and stages (1-4)
-for version, rom_mode in enumerate(_ROM_MODES):
-    for world in range(1, 9):
-        for stage in range(1, 5):
-            # create the target
-            target = (world, stage)
-            # setup the frame-skipping environment
-            env_id = _ID_TEMPLATE.format('', world, stage, version)
-            _register_mario_stage_env(env_id, rom_mode=rom_mode, target=target)
+# a bound formatter for the stage environment IDs
+_format_id = _ID_TEMPLATE.format
+# all the rom modes, worlds (1-8), and stages (1-4) to iterate in one loop
+_STAGE_ENVS = product(enumerate(_ROM_MODES), range(1, 9), range(1, 5))
+for (version, rom_mode), world, stage in _STAGE_ENVS:
+    # setup the frame-skipping environment
+    env_id = _format_id('', world, stage, version)
+    _register_mario_stage_env(env_id, rom_mode=rom_mode, target=(world, stage))
 
 
 # create an alias to gym.make for ease of access
@@ -102,4 +110,4 @@ make = gym.make
 
 
 # define the outward facing API of this module (none, gym provides the API)
-__all__ = [make.__name__]
+__all__ = [make.__name__, 'REGISTERED_ENV_IDS']
@@ -1,6 +1,55 @@
 """A method to decode target values for a ROM stage environment."""
 
 
+# bitmasks of the worlds whose stages 2-4 are offset by an extra area
+# Super Mario Bros.: worlds 1, 2, 4, 7
+_SMB_EXTRA_AREA_WORLDS = (1 << 1) | (1 << 2) | (1 << 4) | (1 << 7)
+# Lost Levels: worlds 1, 3
+_LOST_LEVELS_EXTRA_AREA_WORLDS = (1 << 1) | (1 << 3)
+
+
+# the error message for Lost Levels worlds that are not supported yet
+_UNSUPPORTED_WORLDS_MSG = 'lost levels worlds {} not supported'.format(
+    set(range(5, 12 + 1))
+)
+
+
+def _build_target_areas():
+    """
+    Build the table of target areas for every valid world and stage.
+
+    Returns (dict):
+        a mapping of (lost_levels, world, stage) to the target area. Lost
+        levels worlds that are not supported map to None
+
+    """
+    target_areas = {}
+    # Super Mario Bros. has 8 worlds with an extra area in worlds 1, 2, 4, 7
+    for world in range(1, 8 + 1):
+        for stage in range(1, 4 + 1):
+            area = stage
+            if (1 << world) & _SMB_EXTRA_AREA_WORLDS and stage >= 2:
+                area = area + 1
+            target_areas[False, world, stage] = area
+    # Lost Levels has 12 worlds with an extra area in worlds 1, 3
+    for world in range(1, 12 + 1):
+        for stage in range(1, 4 + 1):
+            area = stage
+            if (1 << world) & _LOST_LEVELS_EXTRA_AREA_WORLDS and stage >= 2:
+                area = area + 1
+            # TODO: figure out why all worlds greater than 5 fail.
+            # for now mark them as unsupported
+            if world >= 5:
+                area = None
+            target_areas[True, world, stage] = area
+
+    return target_areas
+
+
+# the target area for each (lost_levels, world, stage) computed once on import
+_TARGET_AREAS = _build_target_areas()
+
+
 def decode_target(target, lost_levels):
     """
     Return the target area for target world and target stage.
@@ -40,29 +89,11 @@ def decode_target(target, lost_levels):
         if not 1 <= target_stage <= 4:
             raise ValueError('target_stage must be in {1, ..., 4}')
 
-    # no target are defined for no target world or stage situations
-    if target_world is None or target_stage is None:
-        return None
-    # setup target area if target world and stage are specified
-    target_area = target_stage
-    # setup the target area depending on whether this is SMB 1 or 2
-    if lost_levels:
-        # setup the target area depending on the target world and stage
-        if target_world in {1, 3}:
-            if target_stage >= 2:
-                target_area = target_area + 1
-        elif target_world >= 5:
-            # TODO: figure out why all worlds greater than 5 fail.
-            # target_area = target_area + 1
-            # for now just raise a value error
-            worlds = set(range(5, 12 + 1))
-            msg = 'lost levels worlds {} not supported'.format(worlds)
-            raise ValueError(msg)
-    else:
-        # setup the target area depending on the target world and stage
-        if target_world in {1, 2, 4, 7}:
-            if target_stage >= 2:
-                target_area = target_area + 1
+    # look up the target area for the validated world and stage
+    target_area = _TARGET_AREAS[lost_levels, target_world, target_stage]
+    # for now just raise a value error for unsupported lost levels worlds
+    if target_area is None:
+        raise ValueError(_UNSUPPORTED_WORLDS_MSG)
 
     return target_world, target_stage, target_area
 
@@ -11,7 +11,7 @@ _STATUS_MAP = defaultdict(lambda: 'fireball', {0:'small', 1: 'tall'})
 
 
 # a set of state values indicating that Mario is "busy"
-_BUSY_STATES = [0x00, 0x01, 0x02, 0x03, 0x04, 0x05, 0x07]
+_BUSY_STATES = frozenset([0x00, 0x01, 0x02, 0x03, 0x04, 0x05, 0x07])
 
 
 # RAM addresses for enemy types on the screen
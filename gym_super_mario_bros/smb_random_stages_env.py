@@ -1,9 +1,63 @@
 """An OpenAI Gym Super Mario Bros. environment that randomly selects levels."""
+from collections import OrderedDict
 import gym
 import numpy as np
 from .smb_env import SuperMarioBrosEnv
 
 
+# the maximum number of stage pools from reset options to keep parsed
+_POOL_CACHE_SIZE = 8
+
+
+# the number of worlds in the game, i.e., {1, ..., 8}
+_WORLDS = 8
+
+
+# the number of stages in each world, i.e., {1, ..., 4}
+_STAGES_PER_WORLD = 4
+
+
+def _parse_stage(level):
+    """
+    Parse and validate a stage string into its index in the stage list.
+
+    Args:
+        level (str): the stage as '<world>-<stage>', e.g., '4-2'
+
+    Returns (int):
+        the index of the stage, i.e., (world - 1) * 4 + (stage - 1)
+
+    """
+    if not isinstance(level, str):
+        raise TypeError('stages must be of type: str')
+    world, _, stage = level.partition('-')
+    if not (world.isdigit() and stage.isdigit()):
+        msg = 'stages must be of the form <world>-<stage>: {}'
+        raise ValueError(msg.format(level))
+    world, stage = int(world), int(stage)
+    if not (1 <= world <= _WORLDS and 1 <= stage <= _STAGES_PER_WORLD):
+        msg = 'stages must be in {{1-1, ..., {}-{}}}: {}'
+        raise ValueError(msg.format(_WORLDS, _STAGES_PER_WORLD, level))
+
+    return (world - 1) * _STAGES_PER_WORLD + (stage - 1)
+
+
+def _stage_pool(stages):
+    """
+    Return the pool of stages to sample from.
+
+    Args:
+        stages (list): the stage strings to sample from, or None for all
+
+    Returns (tuple):
+        the indexes of the stages, empty to sample from all
+
+    """
+    if stages is None:
+        return ()
+    return tuple(map(_parse_stage, stages))
+
+
 class SuperMarioBrosRandomStagesEnv(gym.Env):
     """A Super Mario Bros. environment that randomly selects levels."""
 
@@ -33,26 +87,90 @@ class SuperMarioBrosRandomStagesEnv(gym.Env):
         """
         # create a dedicated random number generator for the environment
         self.np_random = np.random.RandomState()
-        # setup the environments
-        self.envs = []
-        # iterate over the worlds in the game, i.e., {1, ..., 8}
-        for world in range(1, 9):
-            # append a new list to put this world's stages into
-            self.envs.append([])
-            # iterate over the stages in the world, i.e., {1, ..., 4}
-            for stage in range(1, 5):
-                # create the target as a tuple of the world and stage
-                target = (world, stage)
-                # create the environment with the given ROM mode
-                env = SuperMarioBrosEnv(rom_mode=rom_mode, target=target)
-                # add the environment to the stage list for this world
-                self.envs[-1].append(env)
-        # create a placeholder for the current environment
-        self.env = self.envs[0][0]
+        # the ROM mode to construct the stage environments with
+        self.rom_mode = rom_mode
+        # the stage environments indexed by (world - 1) * 4 + (stage - 1).
+        # each holds a full emulator, so they are None until first used. the
+        # stages cannot share one emulator because nes-py only exposes a
+        # single backup slot per emulator, not exportable save states
+        self._envs = [None] * (_WORLDS * _STAGES_PER_WORLD)
+        # set the subset of stages to choose (parsed into a pool of indexes)
+        self.stages = stages
+        # create a placeholder for the current environment from the first stage
+        # in the pool so that stages outside of the pool are never constructed
+        if self._pool:
+            self.env = self._get_env(self._pool[0])
+        else:
+            self.env = self._get_env(0)
+        # create a cache of the stage pools passed through reset options
+        self._pool_cache = OrderedDict()
         # create a placeholder for the image viewer to render the screen
         self.viewer = None
-        # create a placeholder for the subset of stages to choose
-        self.stages = stages
+
+    @property
+    def stages(self):
+        """Return the subset of stages to choose from, or None for all."""
+        return self._stages
+
+    @stages.setter
+    def stages(self, stages):
+        """
+        Set the subset of stages to choose from.
+
+        Args:
+            stages (list): the stage strings to sample from, or None for all
+
+        Returns:
+            None
+
+        """
+        # parse the stages up front so that reset only samples from the pool
+        self._pool = _stage_pool(stages)
+        self._pool_len = len(self._pool)
+        self._stages = stages
+
+    def _get_env(self, index):
+        """
+        Return the environment for a stage, constructing it on first use.
+
+        Args:
+            index (int): the index of the stage, (world - 1) * 4 + (stage - 1)
+
+        Returns:
+            the SuperMarioBrosEnv for the given stage
+
+        """
+        env = self._envs[index]
+        if env is None:
+            # create the environment with the given ROM mode
+            world, stage = divmod(index, _STAGES_PER_WORLD)
+            target = (world + 1, stage + 1)
+            env = SuperMarioBrosEnv(rom_mode=self.rom_mode, target=target)
+            self._envs[index] = env
+        return env
+
+    def _options_pool(self, stages):
+        """
+        Return the pool for stages passed through the reset options.
+
+        Args:
+            stages (list): the stage strings to sample from, or None for all
+
+        Returns (tuple):
+            the indexes of the stages, empty to sample from all
+
+        """
+        # key on the stage strings (not the list identity) so that mutated or
+        # recycled lists never map to a stale pool
+        key = None if stages is None else tuple(stages)
+        pool = self._pool_cache.get(key)
+        if pool is None:
+            pool = _stage_pool(stages)
+            # evict the oldest pool first
+            if len(self._pool_cache) >= _POOL_CACHE_SIZE:
+                self._pool_cache.popitem(last=False)
+            self._pool_cache[key] = pool
+        return pool
 
     @property
     def screen(self):
@@ -96,21 +214,20 @@ class SuperMarioBrosRandomStagesEnv(gym.Env):
         """
         # Seed the RNG for this environment.
         self.seed(seed)
-        # Get the collection of stages to sample from
-        stages = self.stages
+        # Get the pool of stages to sample from, parsed once on construction
+        pool, pool_len = self._pool, self._pool_len
         if options is not None and 'stages' in options:
-            stages = options['stages']
+            pool = self._options_pool(options['stages'])
+            pool_len = len(pool)
         # Select a random level
-        if stages is not None and len(stages) > 0:
-            level = self.np_random.choice(stages)
-            world, stage = level.split('-')
-            world = int(world) - 1
-            stage = int(stage) - 1
+        if pool_len:
+            index = pool[self.np_random.randint(pool_len)]
         else:
-            world = self.np_random.randint(1, 9) - 1
-            stage = self.np_random.randint(1, 5) - 1
-        # Set the environment based on the world and stage.
-        self.env = self.envs[world][stage]
+            world = self.np_random.randint(1, _WORLDS + 1)
+            stage = self.np_random.randint(1, _STAGES_PER_WORLD + 1)
+            index = int((world - 1) * _STAGES_PER_WORLD + (stage - 1))
+        # Set the environment based on the stage index.
+        self.env = self._get_env(index)
         # reset the environment
         return self.env.reset(
             seed=seed,
@@ -140,12 +257,10 @@ class SuperMarioBrosRandomStagesEnv(gym.Env):
         # make sure the environment hasn't already been closed
         if self.env is None:
             raise ValueError('env has already been closed.')
-        # iterate over each list of stages
-        for stage_lists in self.envs:
-            # iterate over each stage
-            for stage in stage_lists:
-                # close the environment
-                stage.close()
+        # close the stage environments that have been constructed
+        for env in self._envs:
+            if env is not None:
+                env.close()
         # close the environment permanently
         self.env = None
         # if there is an image viewer open, delete it
@@ -0,0 +1,34 @@
+"""Test cases for the command line interface."""
+import argparse
+import io
+import sys
+from unittest import TestCase
+from unittest.mock import patch
+from .._app.cli import _stage, main
+from .._registration import REGISTERED_ENV_IDS
+
+
+class ShouldListEnvs(TestCase):
+    def test(self):
+        stdout = io.StringIO()
+        with patch.object(sys, 'argv', ['gym_super_mario_bros', '--list_envs']):
+            with patch.object(sys, 'stdout', stdout):
+                with self.assertRaises(SystemExit) as context:
+                    main()
+        self.assertEqual(0, context.exception.code)
+        self.assertEqual(REGISTERED_ENV_IDS, stdout.getvalue().splitlines())
+
+
+class ShouldAcceptValidStages(TestCase):
+    def test(self):
+        self.assertEqual('4-2', _stage('4-2'))
+        self.assertEqual('1-1', _stage('1-1'))
+        self.assertEqual('8-4', _stage('8-4'))
+
+
+class ShouldRaiseErrorOnInvalidStages(TestCase):
+    def test(self):
+        self.assertRaises(argparse.ArgumentTypeError, _stage, '9-1')
+        self.assertRaises(argparse.ArgumentTypeError, _stage, '1-5')
+        self.assertRaises(argparse.ArgumentTypeError, _stage, 'a-1')
+        self.assertRaises(argparse.ArgumentTypeError, _stage, '1')
@@ -1,6 +1,7 @@
 """Test cases for the gym registered environments."""
 from unittest import TestCase
-from .._registration import make
+import gym
+from .._registration import make, REGISTERED_ENV_IDS
 
 
 class ShouldMakeEnv:
@@ -411,3 +412,11 @@ class ShouldMakeSuperMarioBrosRandomStagesSubset(ShouldMakeEnv, TestCase):
     stages = ['4-2']
     # the environments ID for all versions of Super Mario Bros
     env_id = ['SuperMarioBrosRandomStages-v{}'.format(v) for v in range(4)]
+
+
+class ShouldListRegisteredEnvIds(TestCase):
+    def test(self):
+        self.assertTrue(REGISTERED_ENV_IDS)
+        self.assertEqual(len(set(REGISTERED_ENV_IDS)), len(REGISTERED_ENV_IDS))
+        for env_id in REGISTERED_ENV_IDS:
+            self.assertIn(env_id, gym.envs.registry)
@@ -0,0 +1,61 @@
+"""Test cases for the Super Mario Bros random stages environment."""
+from unittest import TestCase
+from ..smb_random_stages_env import SuperMarioBrosRandomStagesEnv
+
+
+class ShouldOnlyConstructStagesInPool(TestCase):
+    def test(self):
+        env = SuperMarioBrosRandomStagesEnv(stages=['4-2'])
+        # stage 4-2 is at index (4 - 1) * 4 + (2 - 1)
+        constructed = [i for i, stage in enumerate(env._envs) if stage is not None]
+        self.assertEqual([13], constructed)
+        env.reset(seed=1)
+        constructed = [i for i, stage in enumerate(env._envs) if stage is not None]
+        self.assertEqual([13], constructed)
+        env.close()
+
+
+class ShouldSampleStagesFromResetOptions(TestCase):
+    def test(self):
+        env = SuperMarioBrosRandomStagesEnv(stages=['4-2'])
+        for _ in range(2):
+            env.reset(seed=1, options={'stages': ['1-3']})
+            s, r, d, i = env.step(0)
+            self.assertEqual(1, i['world'])
+            self.assertEqual(3, i['stage'])
+        self.assertEqual(1, len(env._pool_cache))
+        env.close()
+
+
+class ShouldEvictOldestOptionsPool(TestCase):
+    def test(self):
+        env = SuperMarioBrosRandomStagesEnv()
+        for stage in range(1, 5):
+            for world in range(1, 3):
+                env._options_pool(['{}-{}'.format(world, stage)])
+        env._options_pool(['3-1'])
+        self.assertEqual(8, len(env._pool_cache))
+        self.assertNotIn(('1-1',), env._pool_cache)
+        self.assertIn(('3-1',), env._pool_cache)
+        env.close()
+
+
+class ShouldSampleReassignedStages(TestCase):
+    def test(self):
+        env = SuperMarioBrosRandomStagesEnv(stages=['4-2'])
+        env.stages = ['1-3']
+        self.assertEqual(['1-3'], env.stages)
+        env.reset(seed=1)
+        s, r, d, i = env.step(0)
+        self.assertEqual(1, i['world'])
+        self.assertEqual(3, i['stage'])
+        env.close()
+
+
+class ShouldRaiseErrorOnInvalidStages(TestCase):
+    def test(self):
+        self.assertRaises(TypeError, SuperMarioBrosRandomStagesEnv, stages=[(1, 1)])
+        self.assertRaises(ValueError, SuperMarioBrosRandomStagesEnv, stages=['1'])
+        self.assertRaises(ValueError, SuperMarioBrosRandomStagesEnv, stages=['a-1'])
+        self.assertRaises(ValueError, SuperMarioBrosRandomStagesEnv, stages=['9-1'])
+        self.assertRaises(ValueError, SuperMarioBrosRandomStagesEnv, stages=['1-5'])
@@ -1,15 +1,42 @@
 from gym_super_mario_bros import SuperMarioBrosEnv
+import time
+import numpy as np
 import tqdm
 env = SuperMarioBrosEnv()
 
-done = True
+# the number of untimed steps that move the env into the middle of an episode
+WARMUP_STEPS = 200
+# the number of timed steps
+STEPS = 5000
 
+# sample every action up front so the loop only measures the emulator
+actions = np.random.default_rng().integers(
+    0, env.action_space.n,
+    size=WARMUP_STEPS + STEPS,
+    dtype=np.uint8,
+).tolist()
+
+env.reset()
+for action in actions[:WARMUP_STEPS]:
+    _, _, done, _ = env.step(action)
+    if done:
+        env.reset()
+
+# time pure steps only: the timer is paused while resetting after game over
+steps = 0
+elapsed = 0.0
+start = time.perf_counter()
 try:
-    for _ in tqdm.tqdm(range(5000)):
+    for action in tqdm.tqdm(actions[WARMUP_STEPS:]):
+        _, _, done, _ = env.step(action)
+        steps += 1
         if done:
-            state = env.reset()
-            done = False
-        else:
-            state, reward, done, info = env.step(env.action_space.sample())
+            elapsed += time.perf_counter() - start
+            env.reset()
+            start = time.perf_counter()
 except KeyboardInterrupt:
     pass
+elapsed += time.perf_counter() - start
+
+rate = steps / elapsed
+print('{} steps in {:.2f}s: {:.1f} steps/sec'.format(steps, elapsed, rate))
@@ -1,15 +1,6 @@
 import streamlit as st
 import numpy as np
 import time
-import random
-
-# 尝试导入OpenCV，如果失败则使用替代方案
-try:
-    import cv2
-    HAS_CV2 = True
-except ImportError:
-    HAS_CV2 = False
-    st.warning("OpenCV不可用，将使用简化版本")
 
 # 设置页面配置
 st.set_page_config(
@@ -54,71 +45,118 @@ selected_action_space = st.sidebar.selectbox(
 # 游戏速度控制
 game_speed = st.sidebar.slider("游戏速度", 0.01, 0.1, 0.05, 0.01)
 
+# 预生成随机数池的大小（2的幂，按步数位与取下标）
+_POOL_SIZE = 4096
+
+def _random_pool(rng, max_score, min_dx, max_dx):
+    """预生成一批随机步进 (得分增量, 位移, 生命判定值)"""
+    return (
+        rng.integers(0, max_score + 1, _POOL_SIZE, dtype=np.int8),
+        rng.integers(min_dx, max_dx + 1, _POOL_SIZE, dtype=np.int8),
+        rng.random(_POOL_SIZE),
+    )
+
+class GameState:
+    """游戏状态（使用__slots__，按属性访问而非字典查找）"""
+    
+    __slots__ = (
+        'running', 'score', 'lives', 'step_count', 'done', 'mario_x',
+        'manual_pool', 'auto_pool',
+    )
+    
+    def __init__(self):
+        self.running = False
+        self.score = 0
+        self.lives = 3
+        self.step_count = 0
+        self.done = True
+        self.mario_x = 10
+        self.new_pools()
+    
+    def new_pools(self):
+        """重新生成随机动作与自动模式的随机数池"""
+        rng = np.random.default_rng()
+        self.manual_pool = _random_pool(rng, 10, -2, 3)
+        self.auto_pool = _random_pool(rng, 5, -1, 2)
+
 # 初始化游戏状态
 if 'game_state' not in st.session_state:
-    st.session_state.game_state = {
-        'running': False,
-        'score': 0,
-        'lives': 3,
-        'step_count': 0,
-        'done': True,
-        'mario_x': 10
-    }
+    st.session_state.game_state = GameState()
+gs = st.session_state.game_state
+
+# 源画面尺寸与显示尺寸
+_SRC_H, _SRC_W = 240, 256
+_DST_H, _DST_W = 300, 400
+
+# 显示画面每行/每列对应的源画面行/列（最近邻）
+_ROWS = np.arange(_DST_H) * _SRC_H // _DST_H
+_COLS = np.arange(_DST_W) * _SRC_W // _DST_W
+
+def _span(lo, hi, src, dst):
+    """把源画面坐标区间 [lo, hi) 换算为显示画面中的切片（最近邻）"""
+    return slice(-(-lo * dst // src), -(-hi * dst // src))
+
+def _region(y0, y1, x0, x1):
+    """把源画面矩形区域换算为显示画面中的 (行, 列) 切片"""
+    return _span(y0, y1, _SRC_H, _DST_H), _span(x0, x1, _SRC_W, _DST_W)
+
+def _disk_mask(radius):
+    """创建实心圆形掩码"""
+    y, x = np.ogrid[-radius:radius + 1, -radius:radius + 1]
+    return x * x + y * y <= radius * radius
+
+# 金币和云朵的圆形掩码（只计算一次）
+_COIN_MASK = _disk_mask(8)
+_CLOUD_MASK = _disk_mask(15)
+
+# 金币在显示画面中的区域和缩放后的掩码（圆心 (100, 120)）
+_COIN_REGION = _region(112, 129, 92, 109)
+_COIN_MASK_DST = _COIN_MASK[_ROWS[_COIN_REGION[0]] - 112][:, _COLS[_COIN_REGION[1]] - 92]
+
+@st.cache_resource
+def _create_base_frame():
+    """创建静态背景（天空、地面、云朵），直接缩放到显示尺寸（进程内只创建一次）"""
+    frame = np.empty((_SRC_H, _SRC_W, 3), dtype=np.uint8)
+    
+    # 添加背景颜色（模拟天空，RGB）
+    frame[:] = (135, 135, 135)
+    
+    # 添加地面（绿色地面）
+    frame[200:] = (0, 100, 50)
+    
+    # 云朵（白色圆圈，圆心 (50, 50) 和 (60, 50)）
+    frame[35:66, 35:66][_CLOUD_MASK] = 255
+    frame[35:66, 45:76][_CLOUD_MASK] = 255
+    
+    # 静态背景只在这里缩放一次
+    frame = frame[_ROWS[:, None], _COLS]
+    # 所有会话共享同一个背景，设为只读
+    frame.flags.writeable = False
+    return frame
+
+# 静态背景模板 (300x400)，每帧复制到复用的画面缓冲区中
+# 画面缓冲区每次运行单独创建，不在会话之间共享
+_BASE_FRAME = _create_base_frame()
+_SCRATCH = np.empty_like(_BASE_FRAME)
 
 def create_game_frame(step_count, mario_x=10):
-    """创建游戏画面"""
-    # 创建基础画面
-    frame = np.zeros((240, 256, 3), dtype=np.uint8)
+    """创建显示尺寸 (400x300) 的游戏画面（返回复用的缓冲区，下一帧会被覆盖）"""
+    # 从静态背景开始
+    frame = _SCRATCH
+    np.copyto(frame, _BASE_FRAME)
     
-    # 添加背景颜色（模拟天空）
-    frame[:, :, 2] = 135  # 蓝色天空
-    frame[:, :, 1] = 135
-    frame[:, :, 0] = 135
+    # 直接用NumPy切片绘制（RGB颜色）
+    # 马里奥（红色方块）
+    if 0 <= mario_x < 240:
+        frame[_region(180, 201, mario_x, mario_x + 21)] = (255, 0, 0)
     
-    # 添加地面
-    frame[200:, :, 1] = 100  # 绿色地面
-    frame[200:, :, 0] = 50
-    frame[200:, :, 2] = 0
+    # 障碍物（棕色方块）
+    if step_count > 50:
+        frame[_region(190, 201, 150, 171)] = (200, 100, 0)
     
-    if HAS_CV2:
-        # 使用OpenCV绘制图形
-        # 马里奥（红色方块）
-        if 0 <= mario_x < 240:
-            cv2.rectangle(frame, (mario_x, 180), (mario_x + 20, 200), (0, 0, 255), -1)
-        
-        # 障碍物（棕色方块）
-        if step_count > 50:
-            cv2.rectangle(frame, (150, 190), (170, 200), (0, 100, 200), -1)
-        
-        # 金币（黄色圆圈）
-        if step_count % 30 < 15:
-            cv2.circle(frame, (100, 120), 8, (0, 255, 255), -1)
-        
-        # 云朵（白色圆圈）
-        cv2.circle(frame, (50, 50), 15, (255, 255, 255), -1)
-        cv2.circle(frame, (60, 50), 15, (255, 255, 255), -1)
-    else:
-        # 不使用OpenCV的简化版本 - 使用更明显的颜色
-        # 马里奥（红色方块）
-        if 0 <= mario_x < 240:
-            frame[180:200, mario_x:mario_x+20, 0] = 255  # 红色
-            frame[180:200, mario_x:mario_x+20, 1] = 0
-            frame[180:200, mario_x:mario_x+20, 2] = 0
-        
-        # 障碍物（棕色方块）
-        if step_count > 50:
-            frame[190:200, 150:170, 0] = 200  # 棕色
-            frame[190:200, 150:170, 1] = 100
-            frame[190:200, 150:170, 2] = 0
-        
-        # 金币（黄色区域）
-        if step_count % 30 < 15:
-            frame[112:128, 92:108, 0] = 255  # 黄色
-            frame[112:128, 92:108, 1] = 255
-            frame[112:128, 92:108, 2] = 0
-        
-        # 云朵（白色区域）
-        frame[35:65, 35:85, :] = 255  # 白色
+    # 金币（黄色圆圈）
+    if step_count % 30 < 15:
+        frame[_COIN_REGION][_COIN_MASK_DST] = (255, 255, 0)
     
     return frame
 
@@ -136,65 +174,52 @@ with col1:
     
     with col_btn1:
         if st.button("🎮 开始游戏", key="start"):
-            st.session_state.game_state['running'] = True
-            st.session_state.game_state['done'] = False
-            st.session_state.game_state['score'] = 0
-            st.session_state.game_state['lives'] = 3
-            st.session_state.game_state['step_count'] = 0
-            st.session_state.game_state['mario_x'] = 10
+            gs.running = True
+            gs.done = False
+            gs.score = 0
+            gs.lives = 3
+            gs.step_count = 0
+            gs.mario_x = 10
+            gs.new_pools()
             st.success("游戏开始！")
     
     with col_btn2:
         if st.button("🔄 重置游戏", key="reset"):
-            st.session_state.game_state['running'] = False
-            st.session_state.game_state['done'] = True
-            st.session_state.game_state['score'] = 0
-            st.session_state.game_state['lives'] = 3
-            st.session_state.game_state['step_count'] = 0
-            st.session_state.game_state['mario_x'] = 10
+            gs.running = False
+            gs.done = True
+            gs.score = 0
+            gs.lives = 3
+            gs.step_count = 0
+            gs.mario_x = 10
             st.success("游戏已重置！")
     
     with col_btn3:
         if st.button("⏸️ 暂停", key="pause"):
-            st.session_state.game_state['running'] = False
+            gs.running = False
             st.info("游戏已暂停")
     
     with col_btn4:
         if st.button("🎲 随机动作", key="random"):
-            if st.session_state.game_state['running'] and not st.session_state.game_state['done']:
+            if gs.running and not gs.done:
                 # 模拟游戏步进
-                st.session_state.game_state['step_count'] += 1
-                st.session_state.game_state['score'] += random.randint(0, 10)
-                st.session_state.game_state['mario_x'] = (st.session_state.game_state['mario_x'] + random.randint(-2, 3)) % 240
+                scores, dxs, rolls = gs.manual_pool
+                gs.step_count += 1
+                i = gs.step_count & (_POOL_SIZE - 1)
+                gs.score += int(scores[i])
+                gs.mario_x = (gs.mario_x + int(dxs[i])) % 240
                 
                 # 随机减少生命
-                if random.random() < 0.1:
-                    st.session_state.game_state['lives'] -= 1
-                    if st.session_state.game_state['lives'] <= 0:
-                        st.session_state.game_state['done'] = True
-                        st.session_state.game_state['running'] = False
+                if rolls[i] < 0.1:
+                    gs.lives -= 1
+                    if gs.lives <= 0:
+                        gs.done = True
+                        gs.running = False
                 
                 # 生成游戏画面
-                frame = create_game_frame(
-                    st.session_state.game_state['step_count'],
-                    st.session_state.game_state['mario_x']
-                )
+                frame = create_game_frame(gs.step_count, gs.mario_x)
                 
-                # 调整图像大小以适应显示
-                if HAS_CV2:
-                    frame_resized = cv2.resize(frame, (400, 300))
-                    game_placeholder.image(frame_resized, channels="BGR", use_column_width=True)
-                else:
-                    # 不使用OpenCV的简化版本
-                    frame_resized = np.zeros((300, 400, 3), dtype=np.uint8)
-                    # 简单的缩放
-                    for i in range(300):
-                        for j in range(400):
-                            src_i = int(i * 240 / 300)
-                            src_j = int(j * 256 / 400)
-                            if src_i < 240 and src_j < 256:
-                                frame_resized[i, j] = frame[src_i, src_j]
-                    game_placeholder.image(frame_resized, use_column_width=True)
+                # 画面已是显示尺寸，无需缩放
+                game_placeholder.image(frame, channels="RGB", width=400)
                 
                 time.sleep(game_speed)
 
@@ -202,14 +227,14 @@ with col2:
     st.subheader("游戏信息")
     
     # 显示游戏状态
-    st.metric("分数", st.session_state.game_state['score'])
-    st.metric("生命", st.session_state.game_state['lives'])
-    st.metric("步数", st.session_state.game_state['step_count'])
-    st.metric("马里奥位置", st.session_state.game_state['mario_x'])
+    st.metric("分数", gs.score)
+    st.metric("生命", gs.lives)
+    st.metric("步数", gs.step_count)
+    st.metric("马里奥位置", gs.mario_x)
     
-    if st.session_state.game_state['done']:
+    if gs.done:
         st.warning("游戏结束！")
-    elif st.session_state.game_state['running']:
+    elif gs.running:
         st.success("游戏进行中...")
     else:
         st.info("游戏未开始")
@@ -237,39 +262,25 @@ with col2:
 
 # 自动游戏模式
 if st.sidebar.checkbox("自动游戏模式", value=False):
-    if st.session_state.game_state['running'] and not st.session_state.game_state['done']:
+    if gs.running and not gs.done:
         # 自动执行随机动作
-        st.session_state.game_state['step_count'] += 1
-        st.session_state.game_state['score'] += random.randint(0, 5)
-        st.session_state.game_state['mario_x'] = (st.session_state.game_state['mario_x'] + random.randint(-1, 2)) % 240
+        scores, dxs, rolls = gs.auto_pool
+        gs.step_count += 1
+        i = gs.step_count & (_POOL_SIZE - 1)
+        gs.score += int(scores[i])
+        gs.mario_x = (gs.mario_x + int(dxs[i])) % 240
         
         # 随机减少生命
-        if random.random() < 0.05:
-            st.session_state.game_state['lives'] -= 1
-            if st.session_state.game_state['lives'] <= 0:
-                st.session_state.game_state['done'] = True
-                st.session_state.game_state['running'] = False
+        if rolls[i] < 0.05:
+            gs.lives -= 1
+            if gs.lives <= 0:
+                gs.done = True
+                gs.running = False
         
         # 生成游戏画面
-        frame = create_game_frame(
-            st.session_state.game_state['step_count'],
-            st.session_state.game_state['mario_x']
-        )
+        frame = create_game_frame(gs.step_count, gs.mario_x)
         
-        if HAS_CV2:
-            frame_resized = cv2.resize(frame, (400, 300))
-            game_placeholder.image(frame_resized, channels="BGR", use_column_width=True)
-        else:
-            # 不使用OpenCV的简化版本
-            frame_resized = np.zeros((300, 400, 3), dtype=np.uint8)
-            # 简单的缩放
-            for i in range(300):
-                for j in range(400):
-                    src_i = int(i * 240 / 300)
-                    src_j = int(j * 256 / 400)
-                    if src_i < 240 and src_j < 256:
-                        frame_resized[i, j] = frame[src_i, src_j]
-            game_placeholder.image(frame_resized, use_column_width=True)
+        game_placeholder.image(frame, channels="RGB", width=400)
         
         time.sleep(game_speed)
         st.rerun()
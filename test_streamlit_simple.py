@@ -3,10 +3,17 @@
 简单的Streamlit测试版本
 """
 
+import io
 import streamlit as st
 import numpy as np
 import time
-import random
+
+# 用Pillow把画面编码为PNG字节
+try:
+    from PIL import Image
+    HAS_PIL = True
+except ImportError:
+    HAS_PIL = False
 
 # 设置页面配置
 st.set_page_config(
@@ -19,55 +26,87 @@ st.set_page_config(
 st.title("🍄 Super Mario Bros Game - 测试版本")
 st.markdown("---")
 
-def create_simple_frame(step_count, mario_x=10):
-    """创建简单的游戏画面"""
-    # 创建基础画面
-    frame = np.zeros((240, 256, 3), dtype=np.uint8)
+# 画面按原始尺寸发送，由浏览器按最近邻放大，保持像素风格
+st.markdown('<style>img{image-rendering:pixelated;image-rendering:crisp-edges}</style>', unsafe_allow_html=True)
+
+@st.cache_resource
+def _create_background():
+    """创建静态背景（天空、地面、云朵），进程内只创建一次"""
+    frame = np.empty((240, 256, 3), dtype=np.uint8)
     
     # 添加背景颜色（模拟天空）
-    frame[:, :, 2] = 135  # 蓝色天空
-    frame[:, :, 1] = 135
-    frame[:, :, 0] = 135
+    frame[:] = (135, 135, 135)
+    
+    # 添加地面（绿色地面）
+    frame[200:] = (50, 100, 0)
+    
+    # 云朵（白色区域）
+    frame[35:65, 35:85] = 255
     
-    # 添加地面
-    frame[200:, :, 1] = 100  # 绿色地面
-    frame[200:, :, 0] = 50
-    frame[200:, :, 2] = 0
+    # 所有会话共享同一个背景，设为只读
+    frame.flags.writeable = False
+    return frame
+
+# 静态背景模板，绘制时复制到画面缓冲区中
+# 画面缓冲区每次运行单独创建（每次点击都会重新运行脚本），不在会话之间共享
+_BG_TEMPLATE = _create_background()
+_FRAME_BUF = np.empty_like(_BG_TEMPLATE)
+
+def _draw_frame(show_obstacle, show_coin, mario_x):
+    """在画面缓冲区中绘制游戏画面（同一次运行中再次绘制会覆盖）"""
+    # 从静态背景开始，只绘制会变化的部分
+    frame = _FRAME_BUF
+    np.copyto(frame, _BG_TEMPLATE)
     
     # 马里奥（红色方块）
     if 0 <= mario_x < 240:
-        frame[180:200, mario_x:mario_x+20, 0] = 255  # 红色
-        frame[180:200, mario_x:mario_x+20, 1] = 0
-        frame[180:200, mario_x:mario_x+20, 2] = 0
+        frame[180:200, mario_x:mario_x+20] = (255, 0, 0)
     
     # 障碍物（棕色方块）
-    if step_count > 50:
-        frame[190:200, 150:170, 0] = 200  # 棕色
-        frame[190:200, 150:170, 1] = 100
-        frame[190:200, 150:170, 2] = 0
+    if show_obstacle:
+        frame[190:200, 150:170] = (200, 100, 0)
     
     # 金币（黄色区域）
-    if step_count % 30 < 15:
-        frame[112:128, 92:108, 0] = 255  # 黄色
-        frame[112:128, 92:108, 1] = 255
-        frame[112:128, 92:108, 2] = 0
-    
-    # 云朵（白色区域）
-    frame[35:65, 35:85, :] = 255  # 白色
+    if show_coin:
+        frame[112:128, 92:108] = (255, 255, 0)
     
     return frame
 
-def resize_frame_simple(frame, target_width=400, target_height=300):
-    """简单的图像缩放"""
-    frame_resized = np.zeros((target_height, target_width, 3), dtype=np.uint8)
-    # 简单的缩放
-    for i in range(target_height):
-        for j in range(target_width):
-            src_i = int(i * 240 / target_height)
-            src_j = int(j * 256 / target_width)
-            if src_i < 240 and src_j < 256:
-                frame_resized[i, j] = frame[src_i, src_j]
-    return frame_resized
+def create_simple_frame(step_count, mario_x=10):
+    """创建简单的游戏画面（返回画面缓冲区，同一次运行中再次绘制会覆盖）"""
+    return _draw_frame(step_count > 50, step_count % 30 < 15, mario_x)
+
+# 显示宽度（像素），浏览器负责缩放
+_DISPLAY_W = 400
+
+def encode_frame(frame):
+    """把画面编码为PNG字节（zlib最快压缩级别），没有Pillow时直接返回数组"""
+    if not HAS_PIL:
+        return frame
+    buf = io.BytesIO()
+    Image.fromarray(frame).save(buf, format='PNG', compress_level=1)
+    return buf.getvalue()
+
+@st.cache_data(max_entries=1024, show_spinner=False)
+def render_frame(show_obstacle, show_coin, mario_x):
+    """生成并编码游戏画面（缓存结果）
+    
+    画面只取决于障碍物/金币是否显示和马里奥位置，最多 2*2*240 种，
+    按这三项做缓存键，重复的画面不用重新绘制和编码。
+    """
+    return encode_frame(_draw_frame(show_obstacle, show_coin, mario_x))
+
+# 预生成随机数池的大小（2的幂，按步数位与取下标）
+_POOL_SIZE = 4096
+
+def _random_pool():
+    """预生成一批随机步进 (得分增量, 位移, 生命判定值)"""
+    rng = np.random.default_rng()
+    return (
+        rng.integers(0, 11, _POOL_SIZE, dtype=np.int8),
+        rng.integers(-2, 4, _POOL_SIZE, dtype=np.int8),
+        rng.random(_POOL_SIZE),
+    )
 
 # 初始化游戏状态
 if 'game_state' not in st.session_state:
@@ -77,8 +116,43 @@ if 'game_state' not in st.session_state:
         'lives': 3,
         'step_count': 0,
         'done': True,
-        'mario_x': 10
+        'mario_x': 10,
+        'rng_pool': _random_pool()
     }
+gs = st.session_state.game_state
+
+def random_steps(n=1):
+    """模拟n步随机动作（游戏结束时提前停止）"""
+    scores, dxs, rolls = gs['rng_pool']
+    for _ in range(n):
+        gs['step_count'] += 1
+        i = gs['step_count'] & (_POOL_SIZE - 1)
+        gs['score'] += int(scores[i])
+        # 位移只在 [-2, 3] 之间，越界时加/减一次240即可回绕，不需要取模
+        mario_x = gs['mario_x'] + int(dxs[i])
+        if mario_x >= 240:
+            mario_x -= 240
+        elif mario_x < 0:
+            mario_x += 240
+        gs['mario_x'] = mario_x
+        
+        # 随机减少生命
+        if rolls[i] < 0.1:
+            gs['lives'] -= 1
+            if gs['lives'] <= 0:
+                gs['done'] = True
+                gs['running'] = False
+                break
+
+def show_frame():
+    """显示当前游戏画面（原始尺寸，由浏览器放大显示）"""
+    step_count = gs['step_count']
+    frame = render_frame(
+        step_count > 50,
+        step_count % 30 < 15,
+        gs['mario_x']
+    )
+    game_placeholder.image(frame, width=_DISPLAY_W)
 
 # 创建两列布局
 col1, col2 = st.columns([2, 1])
@@ -90,70 +164,60 @@ with col1:
     game_placeholder = st.empty()
     
     # 控制按钮
-    col_btn1, col_btn2, col_btn3, col_btn4 = st.columns(4)
+    col_btn1, col_btn2, col_btn3, col_btn4, col_btn5 = st.columns(5)
     
     with col_btn1:
         if st.button("🎮 开始游戏", key="start"):
-            st.session_state.game_state['running'] = True
-            st.session_state.game_state['done'] = False
-            st.session_state.game_state['score'] = 0
-            st.session_state.game_state['lives'] = 3
-            st.session_state.game_state['step_count'] = 0
-            st.session_state.game_state['mario_x'] = 10
+            gs['running'] = True
+            gs['done'] = False
+            gs['score'] = 0
+            gs['lives'] = 3
+            gs['step_count'] = 0
+            gs['mario_x'] = 10
+            gs['rng_pool'] = _random_pool()
             st.success("游戏开始！")
     
     with col_btn2:
         if st.button("🔄 重置游戏", key="reset"):
-            st.session_state.game_state['running'] = False
-            st.session_state.game_state['done'] = True
-            st.session_state.game_state['score'] = 0
-            st.session_state.game_state['lives'] = 3
-            st.session_state.game_state['step_count'] = 0
-            st.session_state.game_state['mario_x'] = 10
+            gs['running'] = False
+            gs['done'] = True
+            gs['score'] = 0
+            gs['lives'] = 3
+            gs['step_count'] = 0
+            gs['mario_x'] = 10
             st.success("游戏已重置！")
     
     with col_btn3:
         if st.button("⏸️ 暂停", key="pause"):
-            st.session_state.game_state['running'] = False
+            gs['running'] = False
             st.info("游戏已暂停")
     
     with col_btn4:
         if st.button("🎲 随机动作", key="random"):
-            if st.session_state.game_state['running'] and not st.session_state.game_state['done']:
+            if gs['running'] and not gs['done']:
                 # 模拟游戏步进
-                st.session_state.game_state['step_count'] += 1
-                st.session_state.game_state['score'] += random.randint(0, 10)
-                st.session_state.game_state['mario_x'] = (st.session_state.game_state['mario_x'] + random.randint(-2, 3)) % 240
-                
-                # 随机减少生命
-                if random.random() < 0.1:
-                    st.session_state.game_state['lives'] -= 1
-                    if st.session_state.game_state['lives'] <= 0:
-                        st.session_state.game_state['done'] = True
-                        st.session_state.game_state['running'] = False
-                
-                # 生成游戏画面
-                frame = create_simple_frame(
-                    st.session_state.game_state['step_count'],
-                    st.session_state.game_state['mario_x']
-                )
-                
-                # 调整图像大小以适应显示
-                frame_resized = resize_frame_simple(frame, 400, 300)
-                game_placeholder.image(frame_resized, use_column_width=True)
+                random_steps()
+                show_frame()
+    
+    with col_btn5:
+        if st.button("🎲 随机动作 ×10", key="random10"):
+            if gs['running'] and not gs['done']:
+                # 一次运行里连走10步，只绘制最后一帧
+                random_steps(10)
+                show_frame()
 
 with col2:
     st.subheader("游戏信息")
     
     # 显示游戏状态
-    st.metric("分数", st.session_state.game_state['score'])
-    st.metric("生命", st.session_state.game_state['lives'])
-    st.metric("步数", st.session_state.game_state['step_count'])
-    st.metric("马里奥位置", st.session_state.game_state['mario_x'])
+    st.metric("分数", gs['score'])
+    st.metric("生命", gs['lives'])
+    st.metric("步数", gs['step_count'])
+    st.metric("马里奥位置", gs['mario_x'])
     
-    if st.session_state.game_state['done']:
+    if gs['done']:
         st.warning("游戏结束！")
-    elif st.session_state.game_state['running']:
+    elif gs['running']:
         st.success("游戏进行中...")
     else:
         st.info("游戏未开始")
@@ -165,7 +229,7 @@ with col2:
     # 显示原始画面（用于调试）
     if st.button("显示原始画面"):
         frame = create_simple_frame(0, 10)
-        st.image(frame, caption="原始画面 (240x256)", use_column_width=True)
+        st.image(frame, caption="原始画面 (240x256)", width=256)
 
 # 页脚
 st.markdown("---")